@@ -5,7 +5,12 @@ Contains logic to determine if a video's bitrate can be reduced.
 
 import os
 import math
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Sequence
+
+from config import ensure_env
 
 
 def format_bitrate(bitrate: int) -> str:
@@ -18,59 +23,94 @@ def format_bitrate(bitrate: int) -> str:
         return f"{bitrate} bps"
 
 
+# Efficiency of each encoder, compared to AVC
+_ENCODER_MAP = MappingProxyType({
+    # Editing
+    "prores": 3.0,
+    "dnxhd": 3.0,
+    "dnxhr": 3.0,
+
+    # Legacy
+    "mpeg-1": 2.0,
+    "mpeg-2": 1.8,
+    "vc-1": 1.5,
+    "wmv": 1.6,
+    "realvideo": 2.0,
+
+    # MPEG-4 Part 2
+    "mpeg-4 visual": 1.3,
+    "iso/asp": 1.3,
+    "xvid": 1.3,
+    "divx": 1.3,
+    "dx50": 1.3,
+    "mp4v": 1.3,
+
+    # AVC / H.264
+    "avc": 1.0,
+    "h.264": 1.0,
+    "iso/avc": 1.0,
+
+    # HEVC / H.265
+    "hevc": .75,
+    "h.265": .75,
+    "iso/hevc": .75,
+
+    # Google codecs
+    "vp8": 1.2,
+    "vp9": 0.7,
+
+    # AV1
+    "av1": 0.6,
+})
+
+# Map ffmpeg codec names to our encoder efficiency names
+_FFMPEG_ENCODER_MAP = MappingProxyType({
+    'libx264': 'AVC',
+    'libx265': 'HEVC',
+    'libaom-av1': 'AV1',
+    'libvpx-vp9': 'VP9',
+})
+
+
 def obtain_encoder_efficiency(encoder: str) -> float:
     """Obtain the encoder efficiency from a list."""
-    ENCODER_MAP = {
-        # Editing
-        "prores": 3.0,
-        "dnxhd": 3.0,
-        "dnxhr": 3.0,
-
-        # Legacy
-        "mpeg-1": 2.0,
-        "mpeg-2": 1.8,
-        "vc-1": 1.5,
-        "wmv": 1.6,
-        "realvideo": 2.0,
-
-        # MPEG-4 Part 2
-        "mpeg-4 visual": 1.3,
-        "iso/asp": 1.3,
-        "xvid": 1.3,
-        "divx": 1.3,
-        "dx50": 1.3,
-        "mp4v": 1.3,
-
-        # AVC / H.264
-        "avc": 1.0,
-        "h.264": 1.0,
-        "iso/avc": 1.0,
-
-        # HEVC / H.265
-        "hevc": .75,
-        "h.265": .75,
-        "iso/hevc": .75,
-
-        # Google codecs
-        "vp8": 1.2,
-        "vp9": 0.7,
-
-        # AV1
-        "av1": 0.6,
-    }
+    return _ENCODER_MAP.get(encoder.lower(), 0.0)
+
+
+@dataclass(frozen=True, slots=True)
+class ScalingConfig:
+    """Scaling applied to pixel and framerate differences, as percentages."""
+    pixel_scaling: float
+    framerate_scaling: float
+
+
+@dataclass(frozen=True, slots=True)
+class ReferenceConfig:
+    """Reference video that suggested bitrates are scaled from."""
+    width: int
+    height: int
+    framerate: int
+    bitrate: int
+    encoder: str
+
 
-    return ENCODER_MAP.get(encoder.lower(), 0)
+def invalidate_config():
+    """Clear cached configuration so the next call reads the environment again."""
+    load_scaling_config.cache_clear()
+    load_reference_config.cache_clear()
+    load_output_config.cache_clear()
 
 
-def load_scaling_config():
+@lru_cache(maxsize=1)
+def load_scaling_config() -> ScalingConfig:
     """Load configuration from .env file."""
-    load_dotenv()
+    ensure_env()
 
     # Get scaling values (floats)
-    pixel_scaling = float(os.getenv('PIXEL_SCALING', '75.0'))
-    framerate_scaling = float(os.getenv('FRAMERATE_SCALING', '75.0'))
-
-    return pixel_scaling, framerate_scaling
+    return ScalingConfig(
+        pixel_scaling=float(os.getenv('PIXEL_SCALING', '75.0')),
+        framerate_scaling=float(os.getenv('FRAMERATE_SCALING', '75.0'))
+    )
 
 
 def obtain_suggested_bitrate(
@@ -102,7 +142,7 @@ def obtain_suggested_bitrate(
         suggested_bitrate: int suggested bitrate in bits per second
     """
     # Get configuration
-    pixel_scaling, framerate_scaling = load_scaling_config()
+    scaling = load_scaling_config()
 
     # Get pixel count
     pixel_count = width * height
@@ -113,10 +153,10 @@ def obtain_suggested_bitrate(
     reference_encoder_efficiency = obtain_encoder_efficiency(reference_encoder)
 
     # Obtain pixel difference multiplier
-    pixel_multiplier = (pixel_count / reference_pixel_count) ** (pixel_scaling / 100)
+    pixel_multiplier = (pixel_count / reference_pixel_count) ** (scaling.pixel_scaling / 100)
 
     # Obtain framerate difference multiplier
-    framerate_multiplier = (framerate / reference_framerate) ** (framerate_scaling / 100)
+    framerate_multiplier = (framerate / reference_framerate) ** (scaling.framerate_scaling / 100)
 
     # Obtain encoder difference multiplier
     encoder_multiplier = encoder_efficiency / reference_encoder_efficiency
@@ -130,20 +170,19 @@ def obtain_suggested_bitrate(
     return rounded_suggested_bitrate
 
 
-def load_reference_config():
+@lru_cache(maxsize=1)
+def load_reference_config() -> ReferenceConfig:
     """Load configuration from .env file."""
-    load_dotenv()
-
-    # Get video reference values (integers)
-    reference_width = int(os.getenv('REFERENCE_WIDTH', '1920'))
-    reference_height = int(os.getenv('REFERENCE_HEIGHT', '1080'))
-    reference_framerate = int(os.getenv('REFERENCE_FRAMERATE', '24'))
-    reference_bitrate = int(os.getenv('REFERENCE_BITRATE', '6000000'))
-
-    # Get encoder (string)
-    reference_encoder = os.getenv('REFERENCE_ENCODER', 'AVC')
-
-    return reference_width, reference_height, reference_framerate, reference_bitrate, reference_encoder
+    ensure_env()
+
+    # Get video reference values (integers) and encoder (string)
+    return ReferenceConfig(
+        width=int(os.getenv('REFERENCE_WIDTH', '1920')),
+        height=int(os.getenv('REFERENCE_HEIGHT', '1080')),
+        framerate=int(os.getenv('REFERENCE_FRAMERATE', '24')),
+        bitrate=int(os.getenv('REFERENCE_BITRATE', '6000000')),
+        encoder=os.getenv('REFERENCE_ENCODER', 'AVC')
+    )
 
 
 def calculate_suggested_video_bitrate(width: int, height: int, framerate: float, encoder:str) -> int:
@@ -160,14 +199,14 @@ def calculate_suggested_video_bitrate(width: int, height: int, framerate: float,
         suggested_bitrate: int suggested bitrate in bits per second
     """
     # Get configuration
-    reference_width, reference_height, reference_framerate, reference_bitrate, reference_encoder = load_reference_config()
+    reference = load_reference_config()
 
     suggested_bitrate = obtain_suggested_bitrate(
-        reference_width,
-        reference_height,
-        reference_framerate,
-        reference_bitrate,
-        reference_encoder,
+        reference.width,
+        reference.height,
+        reference.framerate,
+        reference.bitrate,
+        reference.encoder,
         width,
         height,
         framerate,
@@ -177,20 +216,74 @@ def calculate_suggested_video_bitrate(width: int, height: int, framerate: float,
     return suggested_bitrate
 
 
-def load_output_config():
-    """Load output encoding configuration from .env file."""
-    load_dotenv()
+def calculate_suggested_video_bitrates_batch(
+    widths: Sequence[int],
+    heights: Sequence[int],
+    framerates: Sequence[float],
+    encoders: Sequence[str]
+) -> List[int]:
+    """
+    Vectorized calculate_suggested_video_bitrate for many videos at once.
+
+    Args:
+        widths: Video widths in pixels
+        heights: Video heights in pixels
+        framerates: Video framerates (fps)
+        encoders: Formats of the videos (AVC, HEVC, AV1)
 
-    # Get video output reference values (integers)
-    reference_width = int(os.getenv('OUTPUT_REFERENCE_WIDTH', '1920'))
-    reference_height = int(os.getenv('OUTPUT_REFERENCE_HEIGHT', '1080'))
-    reference_framerate = int(os.getenv('OUTPUT_REFERENCE_FRAMERATE', '24'))
-    reference_bitrate = int(os.getenv('OUTPUT_REFERENCE_BITRATE', '4500000'))
+    Returns:
+        suggested_bitrates: list of int suggested bitrates in bits per second
+    """
+    # Imported here so modules importing bitrate_logic don't pay for numpy
+    import numpy as np
 
-    # Get encoder (string)
-    reference_encoder = os.getenv('OUTPUT_REFERENCE_ENCODER', 'HEVC')
+    # Get configuration
+    reference = load_reference_config()
+    scaling = load_scaling_config()
+
+    def power_each(bases, exponent):
+        # Rounding up to the next 100 kbps step turns a one-ulp difference into a
+        # whole step, and array np.power can differ from Python's pow by one ulp.
+        # Use Python's pow on each distinct base so results match the scalar function.
+        unique_bases, inverse = np.unique(bases, return_inverse=True)
+        powers = np.array([base ** exponent for base in unique_bases.tolist()], dtype=np.float64)
+        return powers[inverse.reshape(-1)]
+
+    widths = np.asarray(widths, dtype=np.float64)
+    heights = np.asarray(heights, dtype=np.float64)
+    framerates = np.asarray(framerates, dtype=np.float64)
+
+    # Obtain the efficiency of each encoder, compared to AVC, divided by the reference one
+    reference_encoder_efficiency = obtain_encoder_efficiency(reference.encoder)
+    encoder_multipliers = np.array(
+        [obtain_encoder_efficiency(encoder) / reference_encoder_efficiency for encoder in encoders],
+        dtype=np.float64
+    )
 
-    return reference_width, reference_height, reference_framerate, reference_bitrate, reference_encoder
+    # Obtain difference multipliers
+    pixel_multipliers = power_each(widths * heights / (reference.width * reference.height), scaling.pixel_scaling / 100)
+    framerate_multipliers = power_each(framerates / reference.framerate, scaling.framerate_scaling / 100)
+
+    # Obtain suggested bitrates
+    suggested_bitrates = reference.bitrate * pixel_multipliers * framerate_multipliers * encoder_multipliers
+
+    # Round suggested bitrates
+    return (np.ceil(suggested_bitrates / 100000) * 100000).astype(np.int64).tolist()
+
+
+@lru_cache(maxsize=1)
+def load_output_config() -> ReferenceConfig:
+    """Load output encoding configuration from .env file."""
+    ensure_env()
+
+    # Get video output reference values (integers) and encoder (string)
+    return ReferenceConfig(
+        width=int(os.getenv('OUTPUT_REFERENCE_WIDTH', '1920')),
+        height=int(os.getenv('OUTPUT_REFERENCE_HEIGHT', '1080')),
+        framerate=int(os.getenv('OUTPUT_REFERENCE_FRAMERATE', '24')),
+        bitrate=int(os.getenv('OUTPUT_REFERENCE_BITRATE', '4500000')),
+        encoder=os.getenv('OUTPUT_REFERENCE_ENCODER', 'HEVC')
+    )
 
 
 def calculate_encoding_parameters(
@@ -219,26 +312,19 @@ def calculate_encoding_parameters(
         - encoder: Encoder codec name (from .env)
     """
     # Get configuration
-    reference_width, reference_height, reference_framerate, reference_bitrate, reference_encoder = load_output_config()
+    reference = load_output_config()
 
     # Determine target encoder format for calculation
-    # Map ffmpeg codec names to our encoder efficiency names
-    encoder_map = {
-        'libx264': 'AVC',
-        'libx265': 'HEVC',
-        'libaom-av1': 'AV1',
-        'libvpx-vp9': 'VP9',
-    }
-    target_encoder = encoder_map.get(output_encoder, 'HEVC')
+    target_encoder = _FFMPEG_ENCODER_MAP.get(output_encoder, 'HEVC')
 
     # Calculate suggested bitrate using SOURCE dimensions and framerate
     # but with the TARGET encoder
     target_bitrate = obtain_suggested_bitrate(
-        reference_width,
-        reference_height,
-        reference_framerate,
-        reference_bitrate,
-        reference_encoder,
+        reference.width,
+        reference.height,
+        reference.framerate,
+        reference.bitrate,
+        reference.encoder,
         source_width,
         source_height,
         source_framerate,
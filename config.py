@@ -0,0 +1,18 @@
+"""
+Config Module
+Loads the .env file once per process for every module that reads configuration.
+"""
+
+from dotenv import load_dotenv
+
+
+_loaded = False
+
+
+def ensure_env():
+    """Load .env into os.environ on first call only."""
+    global _loaded
+
+    if not _loaded:
+        load_dotenv()
+        _loaded = True
@@ -0,0 +1,15 @@
+"""
+Console Module
+Thread-safe printing shared by every module that reports from worker threads.
+"""
+
+import threading
+
+
+_print_lock = threading.Lock()
+
+
+def safe_print(*args, **kwargs):
+    """Print without interleaving output from other worker threads."""
+    with _print_lock:
+        print(*args, **kwargs)
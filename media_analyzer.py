@@ -7,16 +7,16 @@ Extracts media information from video files and performs various checks.
 import json
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dotenv import load_dotenv
+from typing import List, Dict, Any, Optional, Tuple
 
-from bitrate_logic import calculate_suggested_video_bitrate
-from utils import get_array_from_env_and_file, extract_media_info, normalize_language
+from config import ensure_env
+from bitrate_logic import calculate_suggested_video_bitrate, calculate_suggested_video_bitrates_batch
+from utils import get_array_from_env_and_file, extract_many, normalize_language
 
 
 def load_config():
     """Load configuration from .env file."""
-    load_dotenv()
+    ensure_env()
 
     # Get acceptable difference for bitrate
     acceptable_difference = float(os.getenv('ACCEPTABLE_DIFFERENCE', '10.0'))
@@ -50,40 +50,79 @@ def load_video_files(input_file: str) -> List[str]:
     return video_files
 
 
-def check_video_bitrate_reduction(media_data: Dict[str, Any], acceptable_difference: float) -> Dict[str, Any]:
-    """Check if video bitrate can be reduced."""
-    check_type = "Video bitrate reduction"
+def get_checkable_video_track(media_data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Find the video track the bitrate check can use.
 
+    Returns:
+        (video_track, None) if there's a single video track with all needed info,
+        otherwise (None, reason) explaining why the check can't run
+    """
     if not media_data.get("video_tracks"):
-        return {
-            "type": check_type,
-            "editable": False,
-            "reason": "No video tracks found"
-        }
+        return None, "No video tracks found"
 
     if len(media_data.get("video_tracks")) > 1:
-        return {
-            "type": check_type,
-            "editable": False,
-            "reason": "More than 1 video track found"
-        }
+        return None, "More than 1 video track found"
 
     # Check the first video track
     video = media_data["video_tracks"][0]
 
     if not all([video.get("width"), video.get("height"), video.get("framerate"), video.get("bitrate"), video.get("format")]):
+        return None, "Missing video information (width, height, framerate, bitrate, or format)"
+
+    return video, None
+
+
+def suggest_video_bitrates(media_infos: List[Optional[Dict[str, Any]]]) -> List[Optional[int]]:
+    """Calculate suggested bitrates for all checkable files in one batch. None for the rest."""
+    suggested_bitrates = [None] * len(media_infos)
+
+    indexed_videos = []
+    for index, media_data in enumerate(media_infos):
+        video, _ = get_checkable_video_track(media_data) if media_data else (None, None)
+        if video:
+            indexed_videos.append((index, video))
+
+    if not indexed_videos:
+        return suggested_bitrates
+
+    batch = calculate_suggested_video_bitrates_batch(
+        widths=[video["width"] for _, video in indexed_videos],
+        heights=[video["height"] for _, video in indexed_videos],
+        framerates=[video["framerate"] for _, video in indexed_videos],
+        encoders=[video["format"] for _, video in indexed_videos]
+    )
+
+    for (index, _), suggested_bitrate in zip(indexed_videos, batch):
+        suggested_bitrates[index] = suggested_bitrate
+
+    return suggested_bitrates
+
+
+def check_video_bitrate_reduction(
+    media_data: Dict[str, Any],
+    acceptable_difference: float,
+    suggested_bitrate: Optional[int] = None
+) -> Dict[str, Any]:
+    """Check if video bitrate can be reduced, using suggested_bitrate when precomputed."""
+    check_type = "Video bitrate reduction"
+
+    video, reason = get_checkable_video_track(media_data)
+
+    if not video:
         return {
             "type": check_type,
             "editable": False,
-            "reason": "Missing video information (width, height, framerate, bitrate, or format)"
+            "reason": reason
         }
 
-    suggested_bitrate = calculate_suggested_video_bitrate(
-        width=video["width"],
-        height=video["height"],
-        framerate=video["framerate"],
-        encoder=video["format"]
-    )
+    if suggested_bitrate is None:
+        suggested_bitrate = calculate_suggested_video_bitrate(
+            width=video["width"],
+            height=video["height"],
+            framerate=video["framerate"],
+            encoder=video["format"]
+        )
 
     current_bitrate = video.get("bitrate")
 
@@ -156,17 +195,18 @@ def check_missing_subs(media_data: Dict[str, Any], needed_subs: List[str]) -> Di
     }
 
 
-def analyze_file(file_path: str, acceptable_difference: float, needed_subs: List[str]) -> Optional[Dict[str, Any]]:
-    """Analyze a single video file."""
+def analyze_file(
+    file_path: str,
+    media_data: Optional[Dict[str, Any]],
+    acceptable_difference: float,
+    needed_subs: List[str],
+    suggested_bitrate: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """Analyze a single video file from its extracted media info."""
     print(f"Analyzing: {file_path}")
 
-    if not os.path.exists(file_path):
-        print(f"  Warning: File not found")
-        return None
-
-    # Extract media info
-    media_data = extract_media_info(file_path)
     if not media_data:
+        print(f"  Warning: No media info available")
         return None
 
     # Perform checks
@@ -174,7 +214,7 @@ def analyze_file(file_path: str, acceptable_difference: float, needed_subs: List
         "file_path": file_path,
         "media_info": media_data,
         "checks": [
-            check_video_bitrate_reduction(media_data, acceptable_difference),
+            check_video_bitrate_reduction(media_data, acceptable_difference, suggested_bitrate),
             check_track_defaults(media_data),
             check_missing_subs(media_data, needed_subs)
         ]
@@ -254,10 +294,21 @@ def main():
     
     needed_subs = get_array_from_env_and_file(needed_subs_str, needed_subs_file, 'needed sub')
 
+    # Extract media info concurrently, skipping missing files
+    existing_files = []
+    for video_file in video_files:
+        if os.path.exists(video_file):
+            existing_files.append(video_file)
+        else:
+            print(f"Warning: File not found: {video_file}")
+
+    media_infos = extract_many(existing_files)
+    suggested_bitrates = suggest_video_bitrates(media_infos)
+
     # Analyze each file
     analyses = []
-    for video_file in video_files:
-        analysis = analyze_file(video_file, acceptable_difference, needed_subs)
+    for video_file, media_data, suggested_bitrate in zip(existing_files, media_infos, suggested_bitrates):
+        analysis = analyze_file(video_file, media_data, acceptable_difference, needed_subs, suggested_bitrate)
         if analysis:
             analyses.append(analysis)
 
@@ -0,0 +1,139 @@
+"""
+Media Cache Module
+Persists extracted media information between runs, keyed by file path, mtime and size.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+import msgspec
+
+from config import ensure_env
+from console import safe_print
+
+
+# Number of cache writes to buffer before committing
+COMMIT_BATCH_SIZE = 1000
+
+# Version of the cached media info layout, stored as the database's user_version.
+# Bump whenever the output of extract_media_info changes, so stale entries are dropped.
+CACHE_VERSION = 1
+
+_lock = threading.Lock()
+_connection: Optional[sqlite3.Connection] = None
+_disabled = False
+_pending_writes = 0
+
+# Unknown types are stored as strings, matching the analyzer's JSON output
+_encoder = msgspec.json.Encoder(enc_hook=str)
+_decoder = msgspec.json.Decoder()
+
+
+def _open_cache(cache_file: str) -> sqlite3.Connection:
+    """Open the cache database, dropping entries written by another cache version."""
+    connection = sqlite3.connect(cache_file, check_same_thread=False)
+
+    try:
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_VERSION:
+            connection.execute("DROP TABLE IF EXISTS media_info")
+            connection.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS media_info "
+            "(path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, data BLOB)"
+        )
+        connection.commit()
+    except sqlite3.Error:
+        connection.close()
+        raise
+
+    return connection
+
+
+def _get_connection() -> Optional[sqlite3.Connection]:
+    """Open the cache database on first use. Returns None when caching is disabled or unavailable."""
+    global _connection, _disabled
+
+    if _connection is None and not _disabled:
+        ensure_env()
+
+        cache_file = os.getenv('MEDIA_CACHE_FILE', '.video_cache.db')
+        if not cache_file:
+            _disabled = True
+            return None
+
+        try:
+            _connection = _open_cache(cache_file)
+        except sqlite3.Error as e:
+            # Warn once and run uncached, rather than retrying for every file
+            _disabled = True
+            safe_print(f"Warning: Media cache unavailable, continuing without it: {e}")
+            return None
+
+        atexit.register(close_cache)
+
+    return _connection
+
+
+def close_cache():
+    """Commit pending writes and close the cache database."""
+    global _connection, _pending_writes
+
+    with _lock:
+        if _connection is not None:
+            _connection.commit()
+            _connection.close()
+            _connection = None
+            _pending_writes = 0
+
+
+def cached_media_info(
+    func: Callable[[str], Optional[Dict[str, Any]]]
+) -> Callable[[str], Optional[Dict[str, Any]]]:
+    """Decorate a media info extractor so unchanged files are served from the cache."""
+    @wraps(func)
+    def wrapper(file_path: str) -> Optional[Dict[str, Any]]:
+        global _pending_writes
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            # Let the extractor report missing or unreadable files
+            return func(file_path)
+
+        try:
+            with _lock:
+                connection = _get_connection()
+                row = connection.execute(
+                    "SELECT mtime, size, data FROM media_info WHERE path = ?", (file_path,)
+                ).fetchone() if connection else None
+        except sqlite3.Error as e:
+            safe_print(f"Warning: Media cache lookup failed for {file_path}: {e}")
+            return func(file_path)
+
+        if row and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return _decoder.decode(row[2])
+
+        media_data = func(file_path)
+
+        if media_data is not None and connection is not None:
+            try:
+                with _lock:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO media_info (path, mtime, size, data) VALUES (?, ?, ?, ?)",
+                        (file_path, stat.st_mtime_ns, stat.st_size, _encoder.encode(media_data))
+                    )
+                    _pending_writes += 1
+                    if _pending_writes >= COMMIT_BATCH_SIZE:
+                        connection.commit()
+                        _pending_writes = 0
+            except sqlite3.Error as e:
+                safe_print(f"Warning: Failed to cache media info for {file_path}: {e}")
+
+        return media_data
+
+    return wrapper
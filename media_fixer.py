@@ -10,10 +10,10 @@ import subprocess
 import shutil
 from pathlib import Path
 from typing import List, Dict, Any
-from dotenv import load_dotenv
 from subliminal import scan_video, download_best_subtitles, save_subtitles, region
 from babelfish import Language
 
+from config import ensure_env
 from bitrate_logic import calculate_encoding_parameters
 from utils import extract_media_info, normalize_language
 
@@ -24,7 +24,7 @@ from utils import extract_media_info, normalize_language
 
 def load_config():
     """Load configuration from .env file."""
-    load_dotenv()
+    ensure_env()
 
     # Get file paths generated by video_analyzer
     input_file = os.getenv('EDITABLE_FILES_OUTPUT', 'editable_files.json')
@@ -3,9 +3,78 @@ Utils Module
 Contains misc functions that could be used project wide.
 """
 
+import os
 import pycountry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pymediainfo import MediaInfo
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple
+
+from console import safe_print
+from media_cache import cached_media_info
+
+
+# Worker count for I/O bound fan-out (directory scans, MediaInfo parsing)
+MAX_WORKERS = (os.cpu_count() or 1) * 2
+
+# Output key -> pymediainfo attribute, per track type
+_VIDEO_FIELD_MAP = MappingProxyType({
+    "track_id": "track_id",
+    "stream_order": "stream_order",
+    "format": "format",
+    "codec_id": "codec_id",
+    "width": "width",
+    "height": "height",
+    "framerate": "frame_rate",
+    "bitrate": "bit_rate",
+    "bit_depth": "bit_depth",
+    "default": "default",
+    "forced": "forced",
+})
+
+_AUDIO_FIELD_MAP = MappingProxyType({
+    "track_id": "track_id",
+    "stream_order": "stream_order",
+    "format": "format",
+    "codec_id": "codec_id",
+    "channels": "channel_s",
+    "sampling_rate": "sampling_rate",
+    "bitrate": "bit_rate",
+    "language": "language",
+    "title": "title",
+    "default": "default",
+    "forced": "forced",
+})
+
+_SUBTITLE_FIELD_MAP = MappingProxyType({
+    "track_id": "track_id",
+    "stream_order": "stream_order",
+    "format": "format",
+    "codec_id": "codec_id",
+    "language": "language",
+    "title": "title",
+    "default": "default",
+    "forced": "forced",
+})
+
+
+@lru_cache(maxsize=1)
+def _language_maps() -> Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]]]:
+    """Build lookup tables from lowercase 2 or 3-letter codes to alpha_2 and alpha_3, on first use."""
+    alpha2_by_code = {}
+    alpha3_by_code = {}
+
+    for lang in pycountry.languages:
+        alpha_2 = getattr(lang, "alpha_2", None)
+        alpha_3 = getattr(lang, "alpha_3", None)
+
+        for code in (alpha_2, alpha_3):
+            if code:
+                alpha2_by_code[code.lower()] = alpha_2
+                alpha3_by_code[code.lower()] = alpha_3
+
+    return alpha2_by_code, alpha3_by_code
 
 
 def read_lines_from_file(file_path: str, line_type: str) -> List[str]:
@@ -40,101 +109,79 @@ def get_array_from_env_and_file(env_str: str, file: str, array_type: str) -> Lis
     return paths
 
 
+def _parse_framerate(value: Any) -> Optional[float]:
+    """Convert a MediaInfo frame rate to float, or None when missing or unparseable."""
+    try:
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+@cached_media_info
 def extract_media_info(file_path: str) -> Optional[Dict[str, Any]]:
     """Extract media information from a video file."""
     try:
         media_info = MediaInfo.parse(file_path)
 
         # Extract general info
-        general = media_info.general_tracks[0] if media_info.general_tracks else None
+        general = media_info.general_tracks[0].to_data() if media_info.general_tracks else {}
 
         # Extract video tracks
         video_tracks = []
         for track in media_info.video_tracks:
-            video_tracks.append({
-                "track_id": track.track_id,
-                "stream_order": track.stream_order,
-                "format": track.format,
-                "codec_id": track.codec_id,
-                "width": track.width,
-                "height": track.height,
-                "framerate": float(track.frame_rate) if track.frame_rate else None,
-                "bitrate": track.bit_rate,
-                "bit_depth": track.bit_depth,
-                "default": track.default if hasattr(track, 'default') else None,
-                "forced": track.forced if hasattr(track, 'forced') else None,
-            })
+            data = track.to_data()
+            video_track = {key: data.get(source_key) for key, source_key in _VIDEO_FIELD_MAP.items()}
+            video_track["framerate"] = _parse_framerate(video_track["framerate"])
+            video_tracks.append(video_track)
 
         # Extract audio tracks
         audio_tracks = []
         for track in media_info.audio_tracks:
-            audio_tracks.append({
-                "track_id": track.track_id,
-                "stream_order": track.stream_order,
-                "format": track.format,
-                "codec_id": track.codec_id,
-                "channels": track.channel_s,
-                "sampling_rate": track.sampling_rate,
-                "bitrate": track.bit_rate,
-                "language": track.language if hasattr(track, 'language') else None,
-                "title": track.title if hasattr(track, 'title') else None,
-                "default": track.default if hasattr(track, 'default') else None,
-                "forced": track.forced if hasattr(track, 'forced') else None,
-            })
+            data = track.to_data()
+            audio_tracks.append({key: data.get(source_key) for key, source_key in _AUDIO_FIELD_MAP.items()})
 
         # Extract subtitle tracks
         subtitle_tracks = []
         for track in media_info.text_tracks:
-            subtitle_tracks.append({
-                "track_id": track.track_id,
-                "stream_order": track.stream_order,
-                "format": track.format,
-                "codec_id": track.codec_id,
-                "language": track.language if hasattr(track, 'language') else None,
-                "title": track.title if hasattr(track, 'title') else None,
-                "default": track.default if hasattr(track, 'default') else None,
-                "forced": track.forced if hasattr(track, 'forced') else None,
-            })
+            data = track.to_data()
+            subtitle_tracks.append({key: data.get(source_key) for key, source_key in _SUBTITLE_FIELD_MAP.items()})
 
         return {
             "file_path": file_path,
-            "file_size": general.file_size if general else None,
-            "duration": general.duration if general else None,
-            "format": general.format if general else None,
+            "file_size": general.get("file_size"),
+            "duration": general.get("duration"),
+            "format": general.get("format"),
             "video_tracks": video_tracks,
             "audio_tracks": audio_tracks,
             "subtitle_tracks": subtitle_tracks,
         }
 
     except FileNotFoundError:
-        print(f"Warning: {file_path} not found")
+        safe_print(f"Warning: {file_path} not found")
     except PermissionError as e:
-        print(f"Permission denied from {file_path}: {e}")
+        safe_print(f"Permission denied from {file_path}: {e}")
     except Exception as e:
-        print(f"Error extracting media info from {file_path}: {e}")
+        safe_print(f"Error extracting media info from {file_path}: {e}")
         return None
 
 
+def extract_many(file_paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Extract media information from several video files concurrently, keeping input order."""
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return list(executor.map(extract_media_info, file_paths))
+
+
+@lru_cache(maxsize=512)
 def normalize_language(code: str, to_alpha3: bool = False) -> Optional[str]:
     if not code:
         return None
 
     code = code.lower()
 
-    lang = None
-
-    # Try 2-letter
-    lang = pycountry.languages.get(alpha_2=code)
-
-    # Try 3-letter
-    if not lang:
-        lang = pycountry.languages.get(alpha_3=code)
-
-    if not lang:
-        return None
+    alpha2_by_code, alpha3_by_code = _language_maps()
 
+    # 2-letter and 3-letter codes never collide, so one lookup covers both
     if to_alpha3:
-        return getattr(lang, "alpha_3", None)
+        return alpha3_by_code.get(code)
     else:
-        return getattr(lang, "alpha_2", None)
-
+        return alpha2_by_code.get(code)
@@ -5,16 +5,20 @@ Scans directories for video files and outputs their paths to a text file.
 """
 
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Set
-from dotenv import load_dotenv
+from typing import FrozenSet, Iterator, List, Optional, Pattern, Set
 
-from utils import get_array_from_env_and_file
+from config import ensure_env
+from console import safe_print
+from utils import MAX_WORKERS, get_array_from_env_and_file
 
 
 def load_config():
     """Load configuration from .env file."""
-    load_dotenv()
+    ensure_env()
 
     # Get video extensions from config
     extensions_str = os.getenv('VIDEO_EXTENSIONS', '.mp4,.avi,.mkv,.mov,.wmv,.flv,.webm,.m4v,.mpg,.mpeg')
@@ -30,40 +34,101 @@ def load_config():
     return extensions, scan_paths_str, paths_file, exclusions_str, exclusions_file, output_file
 
 
-def scan_for_videos(directory: str, extensions: Set[str], exclusions: List[str]) -> List[Path]:
-    """Recursively scan directory for video files."""
+def compile_exclusions(exclusions: List[str]) -> Optional[Pattern[str]]:
+    """Compile exclusions into a single case-insensitive pattern, or None if there are none."""
+    if not exclusions:
+        return None
+
+    return re.compile('|'.join(re.escape(exclusion) for exclusion in exclusions), re.IGNORECASE)
+
+
+def _walk_videos(
+    directory: str,
+    extensions_no_dot: FrozenSet[str],
+    exclusion_re: Optional[Pattern[str]],
+    match_start: int = 0
+) -> Iterator[str]:
+    """
+    Yield matching video paths under directory, without following directory symlinks.
+    Paths are joined onto directory as given, so exclusions match the configured path,
+    skipping its first match_start characters.
+    """
+    pending = deque([directory])
+
+    while pending:
+        current = pending.pop()
+
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+
+                    stem, _, ext = entry.name.rpartition('.')
+                    if not (stem and ext.lower() in extensions_no_dot and entry.is_file()):
+                        continue
+
+                    if not (exclusion_re and exclusion_re.search(entry.path[match_start:].replace(os.sep, '/'))):
+                        yield entry.path
+        except PermissionError as e:
+            safe_print(f"Permission denied: {e}")
+
+
+def scan_for_videos(directory: str, extensions: Set[str], exclusions: List[str]) -> List[str]:
+    """Recursively scan directory for video files, returning absolute path strings."""
     video_files = []
     dir_path = Path(directory)
 
     if not dir_path.exists():
-        print(f"Warning: Directory does not exist: {directory}")
+        safe_print(f"Warning: Directory does not exist: {directory}")
         return video_files
 
     if not dir_path.is_dir():
-        print(f"Warning: Not a directory: {directory}")
+        safe_print(f"Warning: Not a directory: {directory}")
         return video_files
 
-    print(f"Scanning: {directory}")
+    safe_print(f"Scanning: {directory}")
+
+    exclusion_re = compile_exclusions(exclusions)
+    extensions_no_dot = frozenset(ext.lstrip('.').lower() for ext in extensions)
+
+    # Walked paths start with the configured root, so swapping in its absolute
+    # form once makes every output path absolute. Like Path.absolute(), this
+    # joins onto the cwd without normalizing '..', which may cross symlinks.
+    root = str(dir_path)
+    if root == os.curdir:
+        # Path('.') joins children without a './' prefix; match and output the same way
+        prefix_len = len(os.curdir + os.sep)
+        absolute_prefix = os.path.join(os.getcwd(), '')
+        match_start = prefix_len
+    else:
+        prefix_len = len(root)
+        absolute_prefix = os.path.join(os.getcwd(), root)
+        match_start = 0
 
     try:
-        for file_path in dir_path.rglob('*'):
-            if file_path.is_file():
-                if file_path.suffix.lower() in extensions:
-                    if not any(exclusion.lower() in file_path.as_posix().lower() for exclusion in exclusions):
-                        video_files.append(file_path)
+        for file_path in _walk_videos(root, extensions_no_dot, exclusion_re, match_start):
+            video_files.append(absolute_prefix + file_path[prefix_len:])
     except PermissionError as e:
-        print(f"Permission denied: {e}")
+        safe_print(f"Permission denied: {e}")
     except Exception as e:
-        print(f"Error scanning {directory}: {e}")
+        safe_print(f"Error scanning {directory}: {e}")
 
     return video_files
 
 
-def write_results(video_files: List[Path], output_file: str):
-    """Write video file paths to output file."""
+def _path_sort_key(video_path: str) -> List[str]:
+    """Sort key matching Path ordering, which compares paths part by part."""
+    return os.path.normcase(video_path).split(os.sep)
+
+
+def write_results(video_files: List[str], output_file: str):
+    """Write video file paths to output file, sorting the list in place."""
+    video_files.sort(key=_path_sort_key)
+
     with open(output_file, 'w', encoding='utf-8') as f:
-        for video_path in sorted(video_files):
-            f.write(f"{video_path.absolute()}\n")
+        f.writelines(f"{video_path}\n" for video_path in video_files)
 
     print(f"\nResults written to: {output_file}")
     print(f"Total video files found: {len(video_files)}")
@@ -92,12 +157,14 @@ def main():
     exclusions = get_array_from_env_and_file(exclusions_str, exclusions_file, 'exclusion')
     print()
 
-    # Scan all directories
+    # Scan all directories concurrently, reporting in configured order
     all_videos = []
-    for path in scan_paths:
-        videos = scan_for_videos(path, extensions_set, exclusions)
-        all_videos.extend(videos)
-        print(f"  Found {len(videos)} video(s) in this directory")
+    with ThreadPoolExecutor(max_workers=min(len(scan_paths), MAX_WORKERS)) as executor:
+        results = executor.map(lambda path: scan_for_videos(path, extensions_set, exclusions), scan_paths)
+
+        for path, videos in zip(scan_paths, results):
+            all_videos.extend(videos)
+            safe_print(f"  Found {len(videos)} video(s) in {path}")
 
     # Write results
     if all_videos: